@@ -6,11 +6,11 @@
 #
 # Copyright (c) 2025 Kirigen, all rights reserved.
 
-from typing import List, Union
+from typing import Any, AsyncIterator, List, Optional, Tuple, Union
 
 from .base import (
     # import the base classes from the base module
-    Pipeline, PipelineFlow, PipelineProvider
+    Pipeline, PipelineFlow, PipelineProvider, install_event_loop
 )
 
 from .types import ( 
@@ -21,34 +21,42 @@ from .types import (
 # Queues
 QUEUE_TYPES = Union['BatchFlow', 'ConcurrentFlow', 'LoadBalancedFlow', 'ParallelFlow', 'PriorityFlow', 'SequentialFlow']
 
-class BatchFlow(PipelineFlow):
-    def __init__(self, name: str, max_requests:int = 1, policy:BalancingPolicy = BalancingPolicy.FIFO, provider: PipelineProvider = None, streams: List[QUEUE_TYPES] = None):
+class _NamedFlow(PipelineFlow):
+    """Constructor shared by the named flows below, which only differ by their default balancing policy."""
+    def __init__(self, name: str, max_requests:int = 1, policy:Optional[BalancingPolicy] = None, provider: PipelineProvider = None, streams: List[QUEUE_TYPES] = None):
         super().__init__( name=name, max_requests=max_requests, policy=policy, provider=provider, streams=streams)
 
-class ConcurrentFlow(PipelineFlow):
-    def __init__(self, name: str, max_requests:int = 1, policy:BalancingPolicy = BalancingPolicy.FIFO, provider: PipelineProvider = None, streams: List[QUEUE_TYPES] = None):
-        super().__init__( name=name, max_requests=max_requests, policy=policy, provider=provider, streams=streams)
+class BatchFlow(_NamedFlow):
+    """Flow that hands every queued request (up to max_requests) to the provider's process_batch() in one call."""
+    _DEFAULT_POLICY = BalancingPolicy.FIFO
 
-class LoadBalancedFlow(PipelineFlow):
-    def __init__(self, name: str, max_requests:int = 1, policy:BalancingPolicy = BalancingPolicy.LEAST_LOADED, provider: PipelineProvider = None, streams: List[QUEUE_TYPES] = None):
+    def __init__(self, name: str, max_requests:int = 1, policy:Optional[BalancingPolicy] = None, provider: PipelineProvider = None, streams: List[QUEUE_TYPES] = None):
+        if not provider: raise ValueError("BatchFlow submits batches to its own provider and cannot run without one")
         super().__init__( name=name, max_requests=max_requests, policy=policy, provider=provider, streams=streams)
 
-class ParallelFlow(PipelineFlow):
-    def __init__(self, name: str, max_requests:int = 1, policy:BalancingPolicy = BalancingPolicy.PRIORITY, provider: PipelineProvider = None, streams: List[QUEUE_TYPES] = None):
-        super().__init__( name=name, max_requests=max_requests, policy=policy, provider=provider, streams=streams)
+    async def process_requests(self) -> AsyncIterator[Tuple[Any, Any]]:
+        while True:
+            await self._wait_for_requests()
+            batch = [ self._pop() ]
+            while self.queue and len(batch) < self.max_requests: batch.append(self._pop())
 
-class PriorityFlow(PipelineFlow):
-    def __init__(self, name: str, max_requests:int = 1, policy:BalancingPolicy = BalancingPolicy.PRIORITY, provider: PipelineProvider = None, streams: List[QUEUE_TYPES] = None):
-        super().__init__( name=name, max_requests=max_requests, policy=policy, provider=provider, streams=streams)
+            results = list(zip(batch, await self._process_batch(batch)))
+            for request, response in results: await self.complete_request(request, response)
+            for request, response in results: yield request, response
 
-class SequentialFlow(PipelineFlow):
-    def __init__(self, name: str, max_requests:int = 1, policy:BalancingPolicy = BalancingPolicy.FIFO, provider: PipelineProvider = None, streams: List[QUEUE_TYPES] = None):
-        super().__init__( name=name, max_requests=max_requests, policy=policy, provider=provider, streams=streams)
+class ConcurrentFlow(_NamedFlow):       _DEFAULT_POLICY = BalancingPolicy.FIFO
+class LoadBalancedFlow(_NamedFlow):     _DEFAULT_POLICY = BalancingPolicy.LEAST_LOADED
+class ParallelFlow(_NamedFlow):         _DEFAULT_POLICY = BalancingPolicy.PRIORITY
+class PriorityFlow(_NamedFlow):         _DEFAULT_POLICY = BalancingPolicy.PRIORITY
+class SequentialFlow(_NamedFlow):       _DEFAULT_POLICY = BalancingPolicy.FIFO
 
-__all__ = [
+__all__ = (
     # Base
-    "Pipeline"
+    "Pipeline", "PipelineFlow", "PipelineProvider", "install_event_loop",
+
+    # Types
+    "BalancingPolicy",
 
     # Queues
     "BatchFlow", "ConcurrentFlow", "LoadBalancedFlow", "ParallelFlow", "PriorityFlow", "SequentialFlow",
-]
\ No newline at end of file
+)
@@ -0,0 +1,94 @@
+# Kirigen releases 'pipelines' as an open-source library for orchestrating and managing pipelines, 
+# in the hope of enableing developers to create complex workflows with ease. see https://kirigen.co/opensource-initiatives
+#
+# This file (as part of the 'pipelines' library) is open-source and available under the MIT license
+# For more information, see the project repository at https://github.com/kirigen-ai/pipelines
+#
+# Copyright (c) 2025 Kirigen, all rights reserved.
+
+
+
+# Per-request load accounting and child stream selection for PipelineFlow. The module is kept free of asyncio and
+# pydantic and is fully annotated, so it can be compiled with mypyc (`mypyc kirigen/pipelines/_fast.py`) as is;
+# the pure Python module is used when no compiled build is installed.
+
+import heapq, random
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple, final
+
+from .types import BalancingPolicy
+
+@final
+class StreamBalancer:
+    """
+    Tracks the in-flight requests of each child stream of a flow and picks the stream for the next request
+    according to the flow's balancing policy.
+
+    Args:
+        policy (BalancingPolicy): Balancing policy used to pick streams.
+        capacities (List[int]): Maximum number of concurrent requests of each child stream.
+
+    Attributes:
+        loads (array[int]): In-flight requests per child stream.
+        heap (List[Tuple[int, int]], optional): Lazily refreshed min-heap of (load, index) entries, 
+            only kept for BalancingPolicy.LEAST_LOADED.
+    """
+
+    def __init__(self, policy: BalancingPolicy, capacities: List[int]) -> None:
+        self.capacities: List[int] = list(capacities)
+        self.loads: "array[int]" = array('i', [0] * len(self.capacities))
+        self.heap: Optional[List[Tuple[int, int]]] = [ (0, i) for i in range(len(self.capacities)) ] if policy == BalancingPolicy.LEAST_LOADED else None
+        self.next_index: int = 0
+        self._pick: Callable[[StreamBalancer], int] = _POLICY_DISPATCH[policy]
+
+    def acquire(self) -> int:
+        """Pick a child stream and account for the new request."""
+        idx = self._pick(self)
+        self.loads[idx] += 1
+        if self.heap is not None: heapq.heappush(self.heap, (self.loads[idx], idx))
+        return idx
+
+    def release(self, idx: int) -> None:
+        self.loads[idx] -= 1
+        if self.heap is None: return
+        if len(self.heap) < 4 * len(self.loads): 
+            heapq.heappush(self.heap, (self.loads[idx], idx))
+        else:                                                               # too many stale entries, rebuild from the current loads
+            self.heap = sorted((load, i) for i, load in enumerate(self.loads))
+
+def _fifo_pick(balancer: StreamBalancer) -> int:
+    """First child stream with spare capacity, or the first stream when all are busy."""
+    for idx, load in enumerate(balancer.loads):
+        if load < balancer.capacities[idx]: return idx
+    return 0
+
+def _random_pick(balancer: StreamBalancer) -> int:
+    """Less loaded of two distinct random child streams (two steps of a partial Fisher-Yates shuffle)."""
+    loads = balancer.loads
+    count = len(loads)
+    if count == 1: return 0
+    a, b = random.randrange(count), random.randrange(count - 1)
+    if b >= a: b += 1
+    return a if loads[a] <= loads[b] else b
+
+def _round_robin_pick(balancer: StreamBalancer) -> int:
+    idx = balancer.next_index
+    balancer.next_index = (idx + 1) % len(balancer.loads)
+    return idx
+
+def _least_loaded_pick(balancer: StreamBalancer) -> int:
+    """Pop the heap until an entry matches the current load of its stream."""
+    heap, loads = balancer.heap, balancer.loads
+    assert heap is not None
+    while True:
+        load, idx = heapq.heappop(heap)
+        if load == loads[idx]: return idx
+
+# Child stream picker for each balancing policy (priority only changes the order of the queue)
+_POLICY_DISPATCH: Dict[BalancingPolicy, Callable[[StreamBalancer], int]] = {
+    BalancingPolicy.FIFO:           _fifo_pick,
+    BalancingPolicy.RANDOM:         _random_pick,
+    BalancingPolicy.ROUND_ROBIN:    _round_robin_pick,
+    BalancingPolicy.LEAST_LOADED:   _least_loaded_pick,
+    BalancingPolicy.PRIORITY:       _fifo_pick,
+}
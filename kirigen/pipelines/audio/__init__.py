@@ -6,10 +6,17 @@
 #
 # Copyright (c) 2025 Kirigen, all rights reserved.
 
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from hashlib import blake2b
+from typing import Any, AsyncIterator
+
 from .. import PipelineProvider
 from ..types import PipelineCapabilities
+from ..utils import ConnectionPool
 from .metrics import SpeechPipelineRequestMetrics
-from .requests import SpeechSynthesisRequest, SpeechRecognitionRequest, SpeechSynthesisResult, SpeechRecognitionResult
+from .requests import _next_id, SpeechSynthesisRequest, SpeechSynthesisStreamRequest, SpeechRecognitionRequest, SpeechSynthesisResult, SpeechRecognitionResult
 
 class SpeechSynthesisProvider(PipelineProvider):
     """
@@ -23,20 +30,23 @@ class SpeechSynthesisProvider(PipelineProvider):
         api_url (str): Base URL for the speech service API endpoints
         retries (int): Number of retry attempts for failed API calls (default: 3)
         retry_delay (float): Delay in seconds between retry attempts (default: 1.0)
+        num_prewarm (int): Number of connections opened by initialize() (default: 3)
+        max_connections (int): Maximum number of open connections, 0 for unlimited (default: 0)
+        cache_size (int): Maximum number of results cached by request content, 0 to disable (default: 64)
     
     Example:
         ```python
         class MyTTSProvider(SpeechSynthesisProvider):
-            async def initialize(self):
-                # Setup provider-specific resources
-                return True
-            async def process_request(self, request):
-                # Implement TTS logic
+            async def _open_conn(self):
+                # Open a provider connection (session, websocket, ...)
+                return await websockets.connect(self.api_url)
+            async def synthesize(self, request, conn):
+                # Implement TTS logic over the pooled connection
                 return SpeechSynthesisResult(...)
         ```
     The provider implements the PipelineCapabilities.SYNTHETIC_SPEECH capability
     and requires concrete implementations to handle:
-    - Resource initialization and cleanup
+    - Opening (and optionally closing) provider connections
     - Health status verification
     - Text-to-speech processing
     - Performance metrics collection
@@ -45,19 +55,37 @@ class SpeechSynthesisProvider(PipelineProvider):
         Implementations should handle API rate limiting, authorization,
         and error handling appropriately for their specific service.
         The retry mechanism helps handle transient failures gracefully.
+        Connections are reused across requests; call self._pool.invalidate(conn)
+        when a connection is known to be broken.
+        Services that synthesize several texts per call should override
+        process_batch() so BatchFlow can submit queued requests together.
+        Identical requests are served from an in-memory LRU cache keyed by a
+        BLAKE2 hash of the text and voice settings; disable it (cache_size=0)
+        for services whose output is intentionally non-deterministic.
+        Services that accept incremental text (e.g. an LLM token stream) should
+        implement synthesize_stream(), so stream_request() can start producing
+        audio from the first chunk of text on an already pooled connection.
     
     Raises:
         NotImplementedError: When abstract methods are not implemented by subclass
     """
 
-    def __init__(self, api_key: str, model_id: str, api_url: str, retries: int = 3, retry_delay: float = 1.0):
-        super().__init__(api_key=api_key, model_id=model_id, api_url=api_url, capabilities=[PipelineCapabilities.SYNTHETIC_SPEECH])
+    def __init__(self, api_key: str, model_id: str, api_url: str, retries: int = 3, retry_delay: float = 1.0, num_prewarm: int = 3, max_connections: int = 0, cache_size: int = 64):
+        super().__init__(api_key=api_key, model_id=model_id, api_url=api_url, capabilities=PipelineCapabilities.SYNTHETIC_SPEECH)
         self.retries = retries              # Maximum number of retry attempts for failed pipeline initializations
         self.retry_delay = retry_delay      # Time to wait between retry attempts in seconds
+        self.num_prewarm = num_prewarm      # Number of connections opened ahead of the first request
+        self.cache_size = max(cache_size, 0)    # Maximum number of cached results (0 disables caching)
+        self.max_connections = max_connections  # Maximum number of open connections (0 for unlimited)
+
+        self._cache: "OrderedDict[bytes, SpeechSynthesisResult]" = OrderedDict()
+        self._pool = self._create_pool()
 
     async def initialize(self) -> bool:
         """Setup provider resources"""
-        raise NotImplementedError()
+        if self._pool.closed: self._pool = self._create_pool()         # restarted after cleanup()
+        await self._pool.prewarm(self.num_prewarm)
+        return True
     
     async def health_check(self) -> bool:
         """Verify provider status"""
@@ -65,16 +93,64 @@ class SpeechSynthesisProvider(PipelineProvider):
 
     async def process_request(self, request: SpeechSynthesisRequest) -> SpeechSynthesisResult:
         """Process a request"""
+        if isinstance(request, SpeechSynthesisStreamRequest): raise ValueError("Stream requests must be synthesized through stream_request()")
+        key = self._cache_key(request) if self.cache_size else None
+        if key and (result := self._cache.get(key)):
+            self._cache.move_to_end(key)
+            return replace(result, id=_next_id(), created=time.time_ns())     # a cache hit is a new result with the same audio
+
+        async with self._pool.get() as conn:
+            result = await self.synthesize(request, conn)
+
+        if key:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size: self._cache.popitem(last=False)
+        return result
+
+    async def synthesize(self, request: SpeechSynthesisRequest, conn: Any) -> SpeechSynthesisResult:
+        """Synthesize speech for a request using a pooled connection"""
+        raise NotImplementedError()
+
+    @property
+    def streaming(self) -> bool:
+        """Check whether the provider implements synthesize_stream()"""
+        return type(self).synthesize_stream is not SpeechSynthesisProvider.synthesize_stream
+
+    async def stream_request(self, request: SpeechSynthesisStreamRequest) -> AsyncIterator[bytes]:
+        """Stream audio for a request while its text is still arriving"""
+        async with self._pool.get() as conn:
+            async for chunk in self.synthesize_stream(request, conn): yield chunk
+
+    def synthesize_stream(self, request: SpeechSynthesisStreamRequest, conn: Any) -> AsyncIterator[bytes]:
+        """Synthesize audio chunks from a text stream using a pooled connection"""
         raise NotImplementedError()
     
     async def cleanup(self) -> None:
         """Release resources"""
-        raise NotImplementedError()
+        await self._pool.aclose()
     
     def get_metrics(self) -> SpeechPipelineRequestMetrics:
         """Return provider metrics"""
         raise NotImplementedError()
 
+    async def _open_conn(self) -> Any:
+        """Open a new provider connection"""
+        raise NotImplementedError()
+
+    async def _close_conn(self, conn: Any) -> None:
+        """Close a provider connection"""
+        pass
+
+    def _create_pool(self) -> ConnectionPool:
+        """Connection pool whose connections are recycled after 60-120s, so they don't all reconnect at the same time"""
+        return ConnectionPool(connect_fn=self._open_conn, close_fn=self._close_conn, max_size=self.max_connections, max_age=60.0, jitter=60.0)
+
+    @staticmethod
+    def _cache_key(request: SpeechSynthesisRequest) -> bytes:
+        """Content hash of everything that affects the synthesized audio"""
+        content = (request.text, request.target, request.speed, request.format, request.quality, request.source_uri)
+        return blake2b(repr(content).encode(), digest_size=16).digest()
+
 class SpeechRecognitionProvider(PipelineProvider):
     """
     This abstract class defines the interface for speech recognition services that can
@@ -87,16 +163,20 @@ class SpeechRecognitionProvider(PipelineProvider):
         api_url (str): Base URL for the provider's API endpoint
         retries (int, optional): Number of retry attempts for failed requests. Defaults to 3
         retry_delay (float, optional): Delay in seconds between retries. Defaults to 1.0
+        num_prewarm (int, optional): Number of connections opened by initialize(). Defaults to 3
+        max_connections (int, optional): Maximum number of open connections, 0 for unlimited. Defaults to 0
     
     Attributes:
         retries (int): Maximum number of retry attempts for failed requests
         retry_delay (float): Time to wait between retry attempts in seconds
+        num_prewarm (int): Number of connections opened ahead of the first request
     
     Methods:
-        initialize(): Sets up necessary resources and connections for the provider
+        initialize(): Pre-warms the connection pool
         health_check(): Verifies the provider service is operational
-        process_request(request): Processes a speech recognition request and returns results
-        cleanup(): Releases any allocated resources
+        process_request(request): Borrows a pooled connection and calls recognize()
+        recognize(request, conn): Processes a speech recognition request and returns results
+        cleanup(): Closes the pooled connections
         get_metrics(): Returns performance and usage metrics for the provider
     
     Example:
@@ -115,19 +195,26 @@ class SpeechRecognitionProvider(PipelineProvider):
         - Specifically handles SPEECH_RECOGNITION capability
         - All provider implementations must override the abstract methods
         - Includes built-in retry mechanism for fault tolerance
+        - Subclasses override _open_conn() (and optionally _close_conn()) to create pooled connections
         - Follows async/await pattern for non-blocking operations
     Raises:
         NotImplementedError: When abstract methods are not implemented by subclass
     """
 
-    def __init__(self, api_key: str, model_id: str, api_url: str, retries: int = 3, retry_delay: float = 1.0):
-        super().__init__(api_key=api_key, model_id=model_id, api_url=api_url, capabilities=[PipelineCapabilities.SPEECH_RECOGNITION])
+    def __init__(self, api_key: str, model_id: str, api_url: str, retries: int = 3, retry_delay: float = 1.0, num_prewarm: int = 3, max_connections: int = 0):
+        super().__init__(api_key=api_key, model_id=model_id, api_url=api_url, capabilities=PipelineCapabilities.SPEECH_RECOGNITION)
         self.retries = retries              # Maximum number of retry attempts for failed pipeline initializations
         self.retry_delay = retry_delay      # Time to wait between retry attempts in seconds
+        self.num_prewarm = num_prewarm      # Number of connections opened ahead of the first request
+        self.max_connections = max_connections  # Maximum number of open connections (0 for unlimited)
+
+        self._pool = self._create_pool()
 
     async def initialize(self) -> bool:
         """Setup provider resources"""
-        raise NotImplementedError()
+        if self._pool.closed: self._pool = self._create_pool()         # restarted after cleanup()
+        await self._pool.prewarm(self.num_prewarm)
+        return True
     
     async def health_check(self) -> bool:
         """Verify provider status"""
@@ -135,16 +222,33 @@ class SpeechRecognitionProvider(PipelineProvider):
 
     async def process_request(self, request: SpeechRecognitionRequest) -> SpeechRecognitionResult:
         """Process a request"""
+        async with self._pool.get() as conn:
+            return await self.recognize(request, conn)
+
+    async def recognize(self, request: SpeechRecognitionRequest, conn: Any) -> SpeechRecognitionResult:
+        """Recognize speech for a request using a pooled connection"""
         raise NotImplementedError()
     
     async def cleanup(self) -> None:
         """Release resources"""
-        raise NotImplementedError()
+        await self._pool.aclose()
     
     def get_metrics(self) -> SpeechPipelineRequestMetrics:
         """Return provider metrics"""
         raise NotImplementedError()
 
+    async def _open_conn(self) -> Any:
+        """Open a new provider connection"""
+        raise NotImplementedError()
+
+    async def _close_conn(self, conn: Any) -> None:
+        """Close a provider connection"""
+        pass
+
+    def _create_pool(self) -> ConnectionPool:
+        """Connection pool whose connections are recycled after 60-120s, so they don't all reconnect at the same time"""
+        return ConnectionPool(connect_fn=self._open_conn, close_fn=self._close_conn, max_size=self.max_connections, max_age=60.0, jitter=60.0)
+
 
 
 __all__ = [ "SpeechSynthesisProvider", "SpeechRecognitionProvider" ]
\ No newline at end of file
@@ -7,8 +7,11 @@
 # Copyright (c) 2025 Kirigen, all rights reserved.
 
 
+from dataclasses import dataclass
+
 from ..metrics import PipelineRequestMetrics
 
+@dataclass(slots=True, kw_only=True)
 class SpeechPipelineRequestMetrics(PipelineRequestMetrics):
     provider_name: str              # name of the provider 
     bandwidth_used: float           # total bandwidth used in MB 
@@ -7,22 +7,54 @@
 # Copyright (c) 2025 Kirigen, all rights reserved.
 
 
-from datetime import datetime
-from pydantic import BaseModel, Field
-from typing import Optional
-from uuid import uuid4
+import os, threading, time
+from dataclasses import dataclass, field
+from pydantic import BaseModel, ConfigDict, Field
+from typing import AsyncIterator, ClassVar, Optional
 
+from ..types import PipelineCapabilities
 from .types import AudioFormat, AudioQuality
 
-class BaseResult(BaseModel):
-    id: uuid4       = Field(description="The ID of the response", default_factory=lambda: uuid4())
-    created: float  = Field(description="The creation time of the response", default_factory=lambda: float(datetime.now().timestamp())) 
+# Result ids are time-ordered integers: milliseconds since 2025-01-01 (41 bits, good until 2094), a 10-bit sequence and the 
+# process id (22 bits, Linux's largest pid_max) in the low bits, so concurrent workers don't collide. Each id is stamped with 
+# the current time, unless more than 1024 ids were handed out in the same millisecond: the sequence then carries into the 
+# timestamp and the process runs slightly ahead of the clock until it catches up. Forked children reseed with their own pid.
+_EPOCH_MS = 1_735_689_600_000
+_PID_BITS, _SEQ_BITS = 22, 10
 
-class SpeechRecognitionRequest(BaseModel): 
+_id_lock = threading.Lock()
+_id_pid = os.getpid() & ((1 << _PID_BITS) - 1)
+_last_id = 0
+
+def _next_id() -> int:
+    global _last_id
+    now = ((time.time_ns() // 1_000_000 - _EPOCH_MS) << (_SEQ_BITS + _PID_BITS)) | _id_pid
+    with _id_lock:
+        _last_id = max(now, _last_id + (1 << _PID_BITS))
+        return _last_id
+
+def _reseed_ids() -> None:
+    """Give a forked child its own process id bits (and a fresh lock, in case the fork happened while it was held)."""
+    global _id_lock, _id_pid, _last_id
+    _id_lock, _id_pid, _last_id = threading.Lock(), os.getpid() & ((1 << _PID_BITS) - 1), 0
+
+if hasattr(os, "register_at_fork"): os.register_at_fork(after_in_child=_reseed_ids)
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class BaseResult:
+    id: int         = field(default_factory=_next_id)       # The ID of the response
+    created: int    = field(default_factory=time.time_ns)   # The creation time of the response (ns since epoch)
+
+class BaseRequest(BaseModel):
+    id: str = Field(description="The ID of the request, used to look up its metrics", default_factory=lambda: str(_next_id()))
+
+class SpeechRecognitionRequest(BaseRequest): 
+    capability: ClassVar[PipelineCapabilities] = PipelineCapabilities.SPEECH_RECOGNITION     # required of the provider
     uri: str                    = Field(description="The uri to use for recognition", default="")
     timecodes: Optional[bool]   = Field(description="Whether to include timecodes in the response", default=False)
 
-class SpeechSynthesisRequest(BaseModel):
+class SpeechSynthesisRequest(BaseRequest):
+    capability: ClassVar[PipelineCapabilities] = PipelineCapabilities.SYNTHETIC_SPEECH       # required of the provider
     text: str                       = Field(description="The text to use for generation", default="")  
     target: Optional[str]           = Field(description="The target voice to use for generation", default=None)
     speed: Optional[float]          = Field(description="The speed to use for generation", default=1.0)    
@@ -30,10 +62,16 @@ class SpeechSynthesisRequest(BaseModel):
     quality: Optional[AudioQuality] = Field(description="The quality to use for generation", default=AudioQuality.HIGH)
     source_uri: Optional[str]       = Field(description="The source audio to use for generation", default=None)
 
+class SpeechSynthesisStreamRequest(SpeechSynthesisRequest):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    text_stream: AsyncIterator[str] = Field(description="The text to use for generation, consumed chunk by chunk as it is produced")
+
+@dataclass(slots=True, frozen=True, kw_only=True)
 class SpeechRecognitionResult(BaseResult):     
-    text: str             = Field(description="The text of the speech recognized", default="")
+    text: str             = ""                  # The text of the speech recognized
 
+@dataclass(slots=True, frozen=True, kw_only=True)
 class SpeechSynthesisResult(BaseResult):     
-    audio: bytes          = Field(description="The audio generated", default_factory=bytes)
-    length: float         = Field(description="The length of the audio", default=0.0)
-    format: AudioFormat   = Field(description="The format of the audio", default=AudioFormat.WAV)
+    audio: bytes          = b""                 # The audio generated
+    length: float         = 0.0                 # The length of the audio
+    format: AudioFormat   = AudioFormat.WAV     # The format of the audio
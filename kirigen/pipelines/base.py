@@ -8,12 +8,16 @@
 
 
 from abc import abstractmethod
-import os, asyncio, time, uuid
-from datetime import datetime
+import heapq, itertools, os, asyncio, time, uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from pydantic import BaseModel, Field
-from typing import Any, Dict, List, Set, Optional, Union, Generic, TypeVar, AsyncIterator
+from typing import Any, Deque, Dict, List, Set, Optional, Tuple, Union, Generic, TypeVar, AsyncIterator
 
+try: import uvloop                                  # optional, faster event loop implementation
+except ImportError: uvloop = None
+
+from ._fast import StreamBalancer
 from .metrics import (
     # import the metrics from the metrics module
     PipelineRequestMetrics, ImagePipelineRequestMetrics, StoragePipelineRequestMetrics
@@ -25,7 +29,28 @@ from .types import (
 )
 
 METRIC_TYPE = Union[PipelineRequestMetrics|ImagePipelineRequestMetrics|StoragePipelineRequestMetrics]
-    
+
+_REMOVED = object()     # placeholder for priority queue entries replaced by PipelineFlow.reprioritize()
+
+def _executor_workers() -> int:
+    """Size of the default thread pool, overridable through the KIRIGEN_ASYNCIO_WORKERS environment variable."""
+    workers = os.environ.get("KIRIGEN_ASYNCIO_WORKERS", "").strip()
+    return int(workers) if workers.isdigit() and int(workers) > 0 else min(4, os.cpu_count() or 1)
+
+def install_event_loop() -> bool:
+    """Make uvloop (when installed) the implementation of the event loops created from now on.
+
+    Call it once before the event loop is created (before asyncio.run()), then call Pipeline.start() 
+    from inside the loop. Returns whether uvloop was installed.
+    """
+    if uvloop is None: return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+def _request_id(request: Any) -> str:
+    """Key used to track a request's metrics (its `id` when it has one)."""
+    return str(getattr(request, "id", None) or id(request))
+
 class Pipeline:
     """Base class for implementing provider pipelines with scaling capabilities.
 
@@ -42,11 +67,17 @@ class Pipeline:
         streams (List[PipelineFlow]): Pipeline flows to distribute across instances.
 
     Properties:
-        request_metrics: Gets metrics for a specific request by ID
+        instances: Returns the number of pipeline instances
         telemetry: Returns pipeline telemetry data
-        capabilities: Returns set of supported pipeline capabilities
+        capabilities: Returns the combined capabilities of all pipeline flows
+
+    Methods:
+        request_metrics: Gets metrics for a specific request by ID
 
         The pipeline will maintain at least one instance unless scale_to_zero=True and both cooldown and max_instances are set to positive values.
+
+    Environment:
+        KIRIGEN_ASYNCIO_WORKERS: Size of the event loop's default thread pool set up by start(). Defaults to min(4, cpu count).
     """
     def __init__(self, 
         instances: int = 1, 
@@ -58,38 +89,79 @@ class Pipeline:
         streams: List['PipelineFlow'] = None):
 
         # Initialize the pipeline with the given parameters.            
-        self.instances = int(instances if instances > 0 else 1)                                                     # at least one instance is required
+        self._instance_count = int(instances if instances > 0 else 1)                                               # at least one instance is required
         self.max_instances = int(max(max_instances, 1) if max_instances > 0 else -1)                                # -1 means no limit (scale to zero is disabled)
         self.cooldown = int(cooldown if cooldown > 0 else -1)                                                       # -1 means no cooldown (scale to zero is disabled)
         self.scale_policy = ScalingPolicy.NONE if not isinstance(scale_policy, ScalingPolicy) else scale_policy     # default to no scaling policy if invalid policy is provided
         self.scale_to_zero = scale_to_zero and self.cooldown > 0 and self.max_instances > 0                         # scale to zero is only enabled if cooldown and max_instances are set
         self.enable_telemetry = enable_telemetry                                                                    # enable telemetry if requested
+        self._executor: Optional[ThreadPoolExecutor] = None                                                         # default thread pool installed by start()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None                                                      # event loop the thread pool was installed on
 
-        # Initialize the pipeline flows and instances.
-        self.instances: List[Pipeline] = [ ( stream for stream in streams ) for _ in range(instances) ]     # create the initial instances
+        # Initialize the pipeline flows (shared by all instances).
+        self._streams: List[PipelineFlow] = list(streams or [])
 
-        @property
-        def request_metrics(self, request_id: str) -> Optional[PipelineRequestMetrics]:
-            """Get the metrics for a specific request."""
-            for stream in (s for streams in self.instances for s in streams):
-                if metrics := stream.request_metrics(request_id): return metrics            
-            return None
-        
-        @property
-        def telemetry(self) -> Dict[str, Any]: pass
+    @property
+    def instances(self) -> int: 
+        return self._instance_count
 
-        @property
-        def capabilities(self) -> Optional[ Set[PipelineCapabilities] ]: pass
-        
-        def start(self): pass        
-        def add_request(self, request): pass
-        async def process_requests(self): pass
-        async def stream_response(self, request, response): pass
-        async def complete_request(self, request, response): pass
-        def stop(self): pass
+    @property
+    def telemetry(self) -> Dict[str, Any]: pass
+
+    @property
+    def capabilities(self) -> PipelineCapabilities:
+        mask = PipelineCapabilities(0)
+        for stream in self._streams: mask |= stream.capabilities
+        return mask
+
+    def request_metrics(self, request_id: str) -> Optional[PipelineRequestMetrics]:
+        """Get the metrics for a specific request."""
+        for stream in self._streams:
+            if metrics := stream.request_metrics(request_id): return metrics
+        return None
+    
+    def start(self):
+        """Prepare the running event loop for the pipeline.
+
+        Must be called from inside the running loop (e.g. at the top of the coroutine passed to 
+        asyncio.run()), after install_event_loop() was called before the loop was created. The eager 
+        task factory (Python 3.12+) is installed so that provider coroutines which complete without 
+        suspending (cache hits, validation errors) never go through the scheduler, asyncio debug mode 
+        (and its per-callback overhead) is turned off, and the default thread pool is capped to a few 
+        workers since providers are expected to be async.
+
+        Raises:
+            RuntimeError: When no event loop is running.
+        """
+        try: loop = asyncio.get_running_loop()
+        except RuntimeError: raise RuntimeError("Pipeline.start() must be called from inside the running event loop") from None
 
-        async def _scale_up(self): pass
-        async def _scale_down(self): pass
+        if eager_task_factory := getattr(asyncio, "eager_task_factory", None): loop.set_task_factory(eager_task_factory)
+        loop.set_debug(False)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=_executor_workers(), thread_name_prefix="kirigen-pipelines")
+            self._loop = loop
+            loop.set_default_executor(self._executor)
+
+    def add_request(self, request): pass
+    async def process_requests(self): pass
+    async def stream_response(self, request: Any) -> AsyncIterator[Any]:
+        """Stream the response to a request from the first streaming flow with the capability the request requires (its `capability`)."""
+        required = getattr(request, "capability", PipelineCapabilities(0))
+        stream = next((stream for stream in self._streams if stream.streaming and (stream.capabilities & required) == required), None)
+        if stream is None: raise ValueError(f"None of the pipeline flows supports streaming responses for {type(request).__name__}")
+        async for chunk in stream.stream_response(request): yield chunk
+
+    async def complete_request(self, request, response): pass
+    def stop(self):
+        """Shut down the thread pool installed by start(), handing its loop a fresh default executor."""
+        if self._executor is None: return
+        if not self._loop.is_closed(): self._loop.set_default_executor(ThreadPoolExecutor())
+        self._executor.shutdown(wait=False)
+        self._executor, self._loop = None, None
+
+    async def _scale_up(self): pass
+    async def _scale_down(self): pass
 
 class PipelineProvider:
     """
@@ -105,9 +177,9 @@ class PipelineProvider:
             Defaults to an empty string.
         model_id (str, optional): Identifier for the specific model to be used within
             the provider's service. Defaults to an empty string.
-        capabilities (Set[PipelineCapabilities], optional): A set of supported
+        capabilities (PipelineCapabilities, optional): Bitmask of supported
             capabilities indicating the provider's features and limitations.
-            Defaults to an empty set.
+            Defaults to no capabilities.
     
     Example:
         ```python
@@ -124,6 +196,7 @@ class PipelineProvider:
         ```
     Note:
         - All providers must implement the initialize(), health_check(), and cleanup() methods
+        - Use supports() to check capabilities; it is a single bitwise AND
         - The class is designed to be asynchronous to handle concurrent operations efficiently
         - Providers should properly manage their resources through the lifecycle methods
 
@@ -131,10 +204,25 @@ class PipelineProvider:
         NotImplementedError: When abstract methods are not implemented by child classes
     """
     
-    api_url: Optional[str]                              = Field(description="The API URL to use for generation", default="")
-    api_key: Optional[str]                              = Field(description="The API key to use for generation", default="")
-    model_id: Optional[str]                             = Field(description="The model ID to use for generation", default="")
-    capabilities: Optional[Set[PipelineCapabilities]]   = Field(description="The capabilities of the provider", default_factory=set)    
+    api_url: Optional[str]              = ""                            # The API URL to use for generation
+    api_key: Optional[str]              = ""                            # The API key to use for generation
+    model_id: Optional[str]             = ""                            # The model ID to use for generation
+    capabilities: PipelineCapabilities  = PipelineCapabilities(0)       # The capabilities of the provider
+
+    def __init__(self, api_url: str = "", api_key: str = "", model_id: str = "", capabilities: PipelineCapabilities = PipelineCapabilities(0)):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.model_id = model_id
+        self.capabilities = PipelineCapabilities(capabilities)
+
+    def supports(self, capability: PipelineCapabilities) -> bool:
+        """Check whether the provider has all of the given capabilities"""
+        return (self.capabilities & capability) == capability
+
+    @property
+    def streaming(self) -> bool:
+        """Check whether the provider can stream responses through stream_request()"""
+        return callable(getattr(self, "stream_request", None))
 
     @abstractmethod
     async def initialize(self) -> bool:
@@ -151,6 +239,14 @@ class PipelineProvider:
         """Process a request"""
         raise NotImplementedError()
 
+    async def process_batch(self, requests: List[Any]) -> List[Any]:
+        """Process a batch of requests, returning one response (or raised exception) per request.
+        
+        Providers backed by a batched API or model should override this to submit the whole batch 
+        in a single call; the default processes the requests concurrently.
+        """
+        return await asyncio.gather(*(self.process_request(request) for request in requests), return_exceptions=True)
+
     @abstractmethod
     async def cleanup(self) -> None:
         """Release resources"""
@@ -176,7 +272,7 @@ class PipelineFlow:
         name (str, optional): Custom identifier for the pipeline flow. If not provided,
             a UUID-based name will be generated.
         policy (BalancingPolicy, optional): Load balancing strategy for request distribution.
-            Defaults to BalancingPolicy.FIFO.
+            Defaults to the class's _DEFAULT_POLICY (BalancingPolicy.FIFO for PipelineFlow).
         provider (PipelineProvider, optional): Provider instance that handles pipeline 
             operations. Defaults to None.
         streams (List[Pipeline], optional): List of pipeline instances to be managed by 
@@ -185,13 +281,18 @@ class PipelineFlow:
     Attributes:
         policy (BalancingPolicy): Active load balancing policy.
         name (str): Unique identifier for this pipeline flow.
+        max_requests (int): Maximum number of provider calls in flight at once.
         provider (PipelineProvider): Associated pipeline provider instance.
         streams (List[Pipeline]): Managed pipeline streams.
-        queue (asyncio.Queue): Asynchronous request queue.
-        semaphore (asyncio.Semaphore): Access control for concurrent operations.
-        _request_metrics (Dict[str, METRIC_TYPE]): Internal storage for request metrics.
+        queue (collections.deque | list): Request queue, drained by a single consumer (process_requests).
+            Flows using BalancingPolicy.PRIORITY keep it as a heap of [priority, seq_no, request] entries.
+        _slots (int): Free provider slots; at most max_requests provider calls run at once, including
+            requests routed to this flow by a parent flow.
+        _active_metrics (Dict[str, METRIC_TYPE]): Metrics of the requests that are queued or running.
+        _request_metrics (OrderedDict[str, METRIC_TYPE]): Internal LRU storage for the metrics of
+            completed requests, bounded to the most recent ones.
     
-    Properties:
+    Methods:
         request_metrics: Retrieves metrics for a specific request ID.
             Args:
                 request_id (str): The ID of the request to fetch metrics for.
@@ -210,9 +311,14 @@ class PipelineFlow:
     
     Notes:
         - The pipeline flow implements thread-safe operations using asyncio primitives
-        - Request metrics are maintained throughout the request lifecycle
+        - Request metrics are maintained throughout the request lifecycle; once completed, they are
+          evicted least recently used first when the flow holds 16 * max_requests completed requests
         - The flow controller automatically generates a unique name if none is provided
         - Supports multiple load balancing policies for different use cases
+        - BalancingPolicy.PRIORITY flows dequeue the lowest priority value first (like `nice`), and
+          requests of equal priority in arrival order, so they cannot starve each other
+        - With child streams, each request runs on a child stream picked by the balancing policy;
+          BalancingPolicy.LEAST_LOADED picks from a min-heap of stream loads (O(log N) per pick)
     
     See Also:
         - Pipeline: Individual pipeline implementation
@@ -220,28 +326,225 @@ class PipelineFlow:
         - BalancingPolicy: Available load balancing strategies
     """
 
+    _DEFAULT_POLICY = BalancingPolicy.FIFO                                  # policy used when none is given
+
     def __init__(self, 
         max_requests: int = 64,
         name: Optional[str] = None,
-        policy: BalancingPolicy = BalancingPolicy.FIFO, 
+        policy: Optional[BalancingPolicy] = None, 
         provider: 'PipelineProvider' = None,
         streams: List['Pipeline'] = None):
 
         # Initialize the pipeline flow with the given parameters.        
-        self.policy   = policy
+        policy        = type(self)._DEFAULT_POLICY if policy is None else policy
+        self.policy   = policy if isinstance(policy, BalancingPolicy) else BalancingPolicy.FIFO
         self.name     = f"pipeline-{uuid.uuid4()}" + ( "" if not name else f":{name}")
         self.provider = provider if provider else None
-        self.streams: List[Pipeline] = streams
+        self.streams: List[Pipeline] = list(streams or [])
+        self.max_requests = int(max_requests if max_requests > 0 else 1)   # at least one request must be able to run
 
-        # Initialize the request queue and semaphore.
+        # Initialize the request queue and provider slots.
         self.load = 0 
-        self.queue = asyncio.Queue() 
-        self.semaphore = asyncio.Semaphore() 
+        self._notify = asyncio.Event()                                      # set whenever a request is queued
+        if self.policy == BalancingPolicy.PRIORITY:
+            self.queue: List[list] = []
+            self._entries: Dict[int, list] = {}                             # queued heap entries by request identity
+            self._seq = itertools.count()                                   # arrival order, breaks priority ties
+            self._push, self._pop = self._push_priority, self._pop_priority
+        else:
+            self.queue: Deque[Any] = deque()
+            self._push, self._pop = self._push_fifo, self._pop_fifo
+        self._slots = self.max_requests                                     # free provider slots
+        self._slot_event = asyncio.Event()                                  # set whenever a slot is released
+        self._slot_event.set()
+        self._pending: Set[asyncio.Task] = set()                            # provider tasks currently in flight
+
+        # Initialize the child stream load accounting and picker.
+        self._balancer = StreamBalancer(self.policy, [ stream.max_requests for stream in self.streams ])
 
         # Initialize the request metrics.
-        self._request_metrics: Dict[str, METRIC_TYPE] = []
+        self._active_metrics: Dict[str, METRIC_TYPE] = {}                   # queued and running requests, never evicted
+        self._request_metrics: "OrderedDict[str, METRIC_TYPE]" = OrderedDict()
+        self._metrics_capacity = self.max_requests * 16                     # metrics are kept for the most recent completed requests only
 
     @property
+    def capabilities(self) -> PipelineCapabilities:
+        """Capabilities of the provider and of all child streams."""
+        mask = self.provider.capabilities if self.provider else PipelineCapabilities(0)
+        for stream in self.streams: mask |= stream.capabilities
+        return mask
+
+    @property
+    def streaming(self) -> bool:
+        """Whether responses can be streamed through this flow (its provider, or every child stream, can stream)."""
+        if self.streams: return all(stream.streaming for stream in self.streams)
+        return self.provider is not None and self.provider.streaming
+
     def request_metrics(self, request_id: str) -> Optional[PipelineRequestMetrics]:
         id = request_id.strip() if request_id else None        
-        return self._request_metrics.get(id, None) if id else None
\ No newline at end of file
+        if not id: return None
+        if metrics := self._active_metrics.get(id): return metrics
+        if id not in self._request_metrics: return None
+        self._request_metrics.move_to_end(id)
+        return self._request_metrics[id]
+
+    def add_request(self, request: Any, priority: int = 0) -> Any:
+        """Queue a request for processing and return it; look up its metrics with request_metrics(request.id)."""
+        self.load += 1
+        self._track_request(request)
+        self._push(request, priority)
+        self._notify.set()
+        return request
+
+    def reprioritize(self, request: Any, priority: int) -> bool:
+        """Change the priority of a request that is still queued in a priority flow."""
+        entry = self._entries.pop(id(request), None) if self.policy == BalancingPolicy.PRIORITY else None
+        if entry is None: return False
+        entry[2] = _REMOVED                                                 # the stale entry is skipped once it reaches the top
+        self._push_priority(request, priority)
+        self._drop_removed()
+        return True
+
+    async def process_requests(self) -> AsyncIterator[Tuple[Any, Any]]:
+        """Dispatch queued requests to the provider and yield `(request, response)` pairs as they complete.
+
+        Queued requests are dispatched straight from the deque; only when it is empty does the loop
+        wait for the next add_request(). It suspends on `asyncio.wait` over the in-flight provider 
+        tasks plus that wait, so it only wakes up when a request arrives or a provider call finishes. At most
+        `max_requests` provider calls run at once; a call that raises is yielded with the exception
+        as its response. Tasks still in flight when the consumer stops iterating are kept and picked
+        up by the next call.
+        """
+        waiter: Optional[asyncio.Future] = None
+        try:
+            while True:
+                while self.queue and len(self._pending) < self.max_requests:
+                    self._pending.add(asyncio.create_task(self._process(self._pop())))
+
+                if waiter is None and not self.queue:
+                    self._notify.clear()
+                    waiter = asyncio.ensure_future(self._notify.wait())
+
+                waiting = self._pending | {waiter} if waiter else self._pending
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+                if waiter in done:
+                    done.discard(waiter)
+                    waiter = None
+
+                for task in done:
+                    self._pending.discard(task)
+                    request, response = task.result()
+                    await self.complete_request(request, response)
+                    yield request, response
+        finally:
+            if waiter is not None: waiter.cancel()
+
+    async def stream_response(self, request: Any) -> AsyncIterator[Any]:
+        """Stream the response to a request from the provider (or a child stream) as it is produced."""
+        self.load += 1
+        try:
+            if self.streams:
+                idx = self._balancer.acquire()
+                try:
+                    async for chunk in self.streams[idx].stream_response(request): yield chunk
+                finally: self._balancer.release(idx)
+                return
+
+            await self._acquire_slot()
+            try:
+                async for chunk in self.provider.stream_request(request): yield chunk
+            finally: self._release_slot()
+        finally:
+            self.load -= 1
+
+    async def complete_request(self, request: Any, response: Any) -> None:
+        """Finalize a processed request."""
+        self.load -= 1
+        id = _request_id(request)
+        if (metrics := self._active_metrics.pop(id, None)) is None: return
+        metrics.complete()
+        if len(self._request_metrics) >= self._metrics_capacity: self._request_metrics.popitem(last=False)
+        self._request_metrics[id] = metrics
+
+    def _push_fifo(self, request: Any, priority: int) -> None:
+        self.queue.append(request)
+
+    def _pop_fifo(self) -> Any:
+        return self.queue.popleft()
+
+    def _push_priority(self, request: Any, priority: int) -> None:
+        entry = [priority, next(self._seq), request]
+        self._entries[id(request)] = entry
+        heapq.heappush(self.queue, entry)
+
+    def _pop_priority(self) -> Any:
+        entry = heapq.heappop(self.queue)
+        request = entry[2]
+        if self._entries.get(id(request)) is entry: del self._entries[id(request)]     # a request queued twice maps to its latest entry
+        self._drop_removed()
+        return request
+
+    def _drop_removed(self) -> None:
+        """Discard replaced entries from the top of the heap, so a non-empty queue always has a live head."""
+        while self.queue and self.queue[0][2] is _REMOVED: heapq.heappop(self.queue)
+
+    async def _wait_for_requests(self) -> None:
+        """Wait until the queue holds at least one request."""
+        while not self.queue:
+            self._notify.clear()
+            await self._notify.wait()
+
+    async def _process(self, request: Any) -> Tuple[Any, Any]:
+        """Run a single request through the provider."""
+        metrics = self._active_metrics.get(_request_id(request))
+        started = time.perf_counter_ns()
+        if metrics: metrics.queue_time = started - metrics.start_time
+        try: return request, await self._call(request)
+        except Exception as e: return request, e
+        finally:
+            if metrics: metrics.provider_processing_time = time.perf_counter_ns() - started
+
+    async def _process_batch(self, requests: List[Any]) -> List[Any]:
+        """Run a batch of requests through the provider in a single call."""
+        metrics = [ self._active_metrics.get(_request_id(request)) for request in requests ]
+        started = time.perf_counter_ns()
+        for m in metrics: 
+            if m: m.queue_time = started - m.start_time
+        try: 
+            responses = await self.provider.process_batch(requests)
+            if len(responses) != len(requests): raise ValueError(f"Provider returned {len(responses)} responses for a batch of {len(requests)} requests")
+            return responses
+        except Exception as e: return [e] * len(requests)
+        finally:
+            elapsed = time.perf_counter_ns() - started
+            for m in metrics:
+                if m: m.provider_processing_time = elapsed
+
+    async def _call(self, request: Any) -> Any:
+        """Run a request on the provider, or on a child stream picked by the balancing policy."""
+        if not self.streams:
+            await self._acquire_slot()
+            try: return await self.provider.process_request(request)
+            finally: self._release_slot()
+
+        idx = self._balancer.acquire()
+        try: return await self.streams[idx]._call(request)
+        finally: self._balancer.release(idx)
+
+    async def _acquire_slot(self) -> None:
+        """Wait for a free provider slot (nothing is allocated while slots are available)."""
+        while self._slots == 0:
+            self._slot_event.clear()
+            await self._slot_event.wait()
+        self._slots -= 1
+
+    def _release_slot(self) -> None:
+        self._slots += 1
+        self._slot_event.set()
+
+    def _track_request(self, request: Any) -> None:
+        """Start collecting metrics for a request; they join the LRU of completed requests in complete_request()."""
+        id = _request_id(request)
+        self._request_metrics.pop(id, None)
+        self._active_metrics[id] = PipelineRequestMetrics()
@@ -7,21 +7,21 @@
 # Copyright (c) 2025 Kirigen, all rights reserved.
 
 
-import os, asyncio, time
-from datetime import datetime
-from enum import Enum
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Union, Generic, TypeVar, AsyncIterator
+import time
+from dataclasses import dataclass, field
+from typing import Dict
 
-class PipelineRequestMetrics(BaseModel):
-    start_time: float               # Time the request was received
-    queue_time: float               # Time spent in the queue
-    provider_processing_time: float # Time spent processing the request by the provider
-    total_processing_time: float    # Total time spent processing the request (queue + provider)
+@dataclass(slots=True, kw_only=True)
+class PipelineRequestMetrics:
+    start_time: int                 = field(default_factory=time.perf_counter_ns)   # Time the request was received (monotonic, ns)
+    queue_time: int                 = 0                                             # Time spent in the queue (ns)
+    provider_processing_time: int   = 0                                             # Time spent processing the request by the provider (ns)
+    total_processing_time: int      = 0                                             # Total time spent processing the request (queue + provider, ns)
     
     def complete(self):
-        self.total_processing_time = time.time() - self.start_time
+        self.total_processing_time = time.perf_counter_ns() - self.start_time
 
+@dataclass(slots=True, kw_only=True)
 class ImagePipelineRequestMetrics(PipelineRequestMetrics):
     provider_name: str          # name of the provider
     num_steps: int              # number of steps taken to generate the image
@@ -31,6 +31,7 @@ class ImagePipelineRequestMetrics(PipelineRequestMetrics):
     image_aspect_ratio: float   # aspect ratio of the image
     metadata: dict[str, str]    # image metadata
 
+@dataclass(slots=True, kw_only=True)
 class StoragePipelineRequestMetrics(PipelineRequestMetrics):    
     provider_name: str                      # name of the provider    
     operations: Dict[str, int]              # operations performed by the provider
@@ -7,42 +7,76 @@
 # Copyright (c) 2025 Kirigen, all rights reserved.
 
 
-import os, asyncio, time
-from datetime import datetime
-from enum import Enum
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Union, Generic, TypeVar, AsyncIterator
-
-class ScalingPolicy(str, Enum):
-    NONE            = "none"
-    CONCURRENT      = "concurrent"
-    CONNECTIONS     = "connections"
-    LATENCY         = "latency"
-    MEMORY          = "memory"
-    PROCESSING      = "processing"
-
-class BalancingPolicy(str, Enum):
-    FIFO            = "fifo"
-    RANDOM          = "random"
-    ROUND_ROBIN     = "round_robin"
-    LEAST_LOADED    = "least_loaded"
-    PRIORITY        = "priority"
-
-class PipelineCapabilities(str, Enum): 
-    AUDIO_RECOGNITION   = "audio:recognition"     
-    DATA_RECOGNITION    = "data:recognition"     
-    IMAGE_RECOGNITION   = "image:recognition"     
-    MODEL_RECOGNITION   = "model:recognition"     
-    SONG_RECOGNITION    = "song:recognition" 
-    SPEECH_RECOGNITION  = "speech:recognition"
-    TEXT_RECOGNITION    = "text:recognition"     
-    VIDEO_RECOGNITION   = "video:recognition"
+import sys
+from enum import IntEnum, IntFlag
+from typing import Dict, Iterable, List
+
+class ScalingPolicy(IntEnum):
+    NONE            = 0
+    CONCURRENT      = 1
+    CONNECTIONS     = 2
+    LATENCY         = 3
+    MEMORY          = 4
+    PROCESSING      = 5
+
+class BalancingPolicy(IntEnum):
+    FIFO            = 0
+    RANDOM          = 1
+    ROUND_ROBIN     = 2
+    LEAST_LOADED    = 3
+    PRIORITY        = 4
+
+class PipelineCapabilities(IntFlag): 
+    AUDIO_RECOGNITION   = 1 << 0
+    DATA_RECOGNITION    = 1 << 1
+    IMAGE_RECOGNITION   = 1 << 2
+    MODEL_RECOGNITION   = 1 << 3
+    SONG_RECOGNITION    = 1 << 4
+    SPEECH_RECOGNITION  = 1 << 5
+    TEXT_RECOGNITION    = 1 << 6
+    VIDEO_RECOGNITION   = 1 << 7
     
-    SYNTHETIC_AUDIO     = "audio:synthesis" 
-    SYNTHETIC_DATA      = "data:synthesis" 
-    SYNTHETIC_IMAGE     = "image:synthesis" 
-    SYNTHETIC_MODEL     = "model:synthesis" 
-    SYNTHETIC_SONG      = "song:synthesis" 
-    SYNTHETIC_SPEECH    = "speech:synthesis"  
-    SYNTHETIC_TEXT      = "text:synthesis" 
-    SYNTHETIC_VIDEO     = "video:synthesis" 
\ No newline at end of file
+    SYNTHETIC_AUDIO     = 1 << 8
+    SYNTHETIC_DATA      = 1 << 9
+    SYNTHETIC_IMAGE     = 1 << 10
+    SYNTHETIC_MODEL     = 1 << 11
+    SYNTHETIC_SONG      = 1 << 12
+    SYNTHETIC_SPEECH    = 1 << 13
+    SYNTHETIC_TEXT      = 1 << 14
+    SYNTHETIC_VIDEO     = 1 << 15
+
+    @classmethod
+    def from_labels(cls, labels: Iterable[str]) -> 'PipelineCapabilities':
+        """Parse wire labels (e.g. "speech:synthesis") into a capability mask."""
+        mask = cls(0)
+        for label in labels: mask |= _LABEL_CAPABILITIES[label]
+        return mask
+
+    @property
+    def labels(self) -> List[str]:
+        """Wire labels of the capabilities set in this mask."""
+        return [ label for capability, label in _CAPABILITY_LABELS.items() if capability & self ]
+
+# Wire labels of each capability, interned so that parsed labels share one string object per capability.
+_CAPABILITY_LABELS: Dict[PipelineCapabilities, str] = { 
+    capability: sys.intern(label) for capability, label in (
+        (PipelineCapabilities.AUDIO_RECOGNITION,    "audio:recognition"),
+        (PipelineCapabilities.DATA_RECOGNITION,     "data:recognition"),
+        (PipelineCapabilities.IMAGE_RECOGNITION,    "image:recognition"),
+        (PipelineCapabilities.MODEL_RECOGNITION,    "model:recognition"),
+        (PipelineCapabilities.SONG_RECOGNITION,     "song:recognition"),
+        (PipelineCapabilities.SPEECH_RECOGNITION,   "speech:recognition"),
+        (PipelineCapabilities.TEXT_RECOGNITION,     "text:recognition"),
+        (PipelineCapabilities.VIDEO_RECOGNITION,    "video:recognition"),
+
+        (PipelineCapabilities.SYNTHETIC_AUDIO,      "audio:synthesis"),
+        (PipelineCapabilities.SYNTHETIC_DATA,       "data:synthesis"),
+        (PipelineCapabilities.SYNTHETIC_IMAGE,      "image:synthesis"),
+        (PipelineCapabilities.SYNTHETIC_MODEL,      "model:synthesis"),
+        (PipelineCapabilities.SYNTHETIC_SONG,       "song:synthesis"),
+        (PipelineCapabilities.SYNTHETIC_SPEECH,     "speech:synthesis"),
+        (PipelineCapabilities.SYNTHETIC_TEXT,       "text:synthesis"),
+        (PipelineCapabilities.SYNTHETIC_VIDEO,      "video:synthesis"),
+    )
+}
+_LABEL_CAPABILITIES: Dict[str, PipelineCapabilities] = { label: capability for capability, label in _CAPABILITY_LABELS.items() }
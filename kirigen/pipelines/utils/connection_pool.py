@@ -0,0 +1,159 @@
+# Kirigen releases 'pipelines' as an open-source library for orchestrating and managing pipelines, 
+# in the hope of enableing developers to create complex workflows with ease. see https://kirigen.co/opensource-initiatives
+#
+# This file (as part of the 'pipelines' library) is open-source and available under the MIT license
+# For more information, see the project repository at https://github.com/kirigen-ai/pipelines
+#
+# Copyright (c) 2025 Kirigen, all rights reserved.
+
+
+
+import asyncio, random, time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Deque, Generic, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class ConnectionPool(Generic[T]):
+    """
+    A pool of reusable provider connections (HTTP sessions, WebSockets, gRPC channels, ...) that
+    lets requests skip the connection handshake. Connections can be opened ahead of time with
+    prewarm() and are recycled after a jittered maximum age so they don't all expire at once.
+
+    Args:
+        connect_fn (Callable[[], Awaitable[T]]): Coroutine function that opens a new connection.
+        close_fn (Callable[[T], Awaitable[None]], optional): Coroutine function that closes a
+            connection. Defaults to None.
+        max_size (int, optional): Maximum number of open connections (idle and in use). Callers
+            wait in get() once the limit is reached. 0 for unlimited. Defaults to 0.
+        max_age (float, optional): Seconds a connection may be reused before it is replaced.
+            None disables expiry. Defaults to None.
+        jitter (float, optional): Up to this many random seconds are added to each connection's
+            max age. Defaults to 0.0.
+
+    Example:
+        ```python
+        pool = ConnectionPool(connect_fn=open_socket, close_fn=close_socket, max_age=60.0, jitter=60.0)
+        await pool.prewarm(3)
+        async with pool.get() as conn:
+            await conn.send(payload)
+        await pool.aclose()
+        ```
+    Note:
+        - A connection is discarded when the body of get() raises, so broken sockets never return to the pool
+        - invalidate() discards a connection explicitly once it is given back
+        - After aclose(), borrowed connections are closed when given back and get()/prewarm() raise RuntimeError
+        - Errors raised while closing a connection are ignored
+    """
+
+    def __init__(self, 
+        connect_fn: Callable[[], Awaitable[T]], 
+        close_fn: Optional[Callable[[T], Awaitable[None]]] = None,
+        max_size: int = 0, 
+        max_age: Optional[float] = None, 
+        jitter: float = 0.0):
+
+        self.max_size = int(max_size if max_size > 0 else 0)                            # 0 means no limit
+        self.max_age = max_age                                                          # None means connections never expire
+        self.jitter = max(float(jitter), 0.0)
+
+        self._connect_fn = connect_fn
+        self._close_fn = close_fn
+        self._idle: Deque[Tuple[T, float]] = deque()                                    # idle connections and their expiry time
+        self._invalidated: Set[int] = set()                                             # ids of borrowed connections to discard
+        self._slots = asyncio.Semaphore(self.max_size) if self.max_size else None       # bounds the number of borrowed connections
+        self._borrowed = 0                                                              # connections currently lent out
+        self._opening = 0                                                               # connections being opened by prewarm()
+        self._closed = False
+
+    @property
+    def idle(self) -> int:
+        """Number of idle connections in the pool."""
+        return len(self._idle)
+
+    @property
+    def closed(self) -> bool:
+        """Whether aclose() has been called; a closed pool cannot be reopened."""
+        return self._closed
+
+    async def prewarm(self, count: int) -> None:
+        """Open connections until at least `count` are idle, without exceeding max_size open connections."""
+        self._check_open()
+        missing = count - len(self._idle) - self._opening
+        if self.max_size: missing = min(missing, self.max_size - len(self._idle) - self._borrowed - self._opening)
+        if missing <= 0: return
+
+        self._opening += missing
+        try: results = await asyncio.gather(*(self._connect() for _ in range(missing)), return_exceptions=True)
+        finally: self._opening -= missing
+
+        errors = [ result for result in results if isinstance(result, BaseException) ]
+        opened = [ result for result in results if not isinstance(result, BaseException) ]
+        if not errors and not self._closed: 
+            self._idle.extend(opened)
+            return
+
+        for conn, _ in opened: await self._close(conn)
+        if errors: raise errors[0]
+
+    @asynccontextmanager
+    async def get(self) -> AsyncIterator[T]:
+        """Borrow a connection, opening a new one if none is idle."""
+        conn, expires = await self._acquire()
+        try:
+            yield conn
+        except BaseException:
+            self._release(conn)
+            await self._close(conn)
+            raise
+
+        self._release(conn)
+        if self._closed or id(conn) in self._invalidated or time.monotonic() >= expires: await self._close(conn)
+        else: self._idle.append((conn, expires))
+
+    def invalidate(self, conn: T) -> None:
+        """Mark a borrowed connection as broken so it is closed instead of reused."""
+        self._invalidated.add(id(conn))
+
+    async def aclose(self) -> None:
+        """Close all idle connections; connections still in use are closed when they are given back."""
+        self._closed = True
+        while self._idle:
+            conn, _ = self._idle.pop()
+            await self._close(conn)
+
+    async def _acquire(self) -> Tuple[T, float]:
+        """Pop the most recently used live connection, or open a new one."""
+        self._check_open()
+        if self._slots: await self._slots.acquire()
+        self._borrowed += 1
+        try:
+            while self._idle:
+                conn, expires = self._idle.pop()
+                if time.monotonic() < expires: return conn, expires
+                await self._close(conn)
+            return await self._connect()
+        except BaseException:
+            self._borrowed -= 1
+            if self._slots: self._slots.release()
+            raise
+
+    async def _connect(self) -> Tuple[T, float]:
+        conn = await self._connect_fn()
+        if self.max_age is None: return conn, float("inf")
+        return conn, time.monotonic() + self.max_age + random.uniform(0.0, self.jitter)
+
+    def _release(self, conn: T) -> None:
+        """Account for a borrowed connection being given back."""
+        self._borrowed -= 1
+        if self._slots: self._slots.release()
+
+    async def _close(self, conn: T) -> None:
+        self._invalidated.discard(id(conn))
+        if not self._close_fn: return
+        try: await self._close_fn(conn)
+        except Exception: pass
+
+    def _check_open(self) -> None:
+        if self._closed: raise RuntimeError("Connection pool is closed")
@@ -0,0 +1,143 @@
+# Kirigen releases 'pipelines' as an open-source library for orchestrating and managing pipelines, 
+# in the hope of enableing developers to create complex workflows with ease. see https://kirigen.co/opensource-initiatives
+#
+# This file (as part of the 'pipelines' library) is open-source and available under the MIT license
+# For more information, see the project repository at https://github.com/kirigen-ai/pipelines
+#
+# Copyright (c) 2025 Kirigen, all rights reserved.
+
+
+import asyncio, os, time, unittest
+
+from kirigen.pipelines import Pipeline, PipelineFlow, PipelineProvider
+from kirigen.pipelines.types import PipelineCapabilities
+from kirigen.pipelines.audio import SpeechSynthesisProvider
+from kirigen.pipelines.audio.requests import _EPOCH_MS, _next_id, SpeechSynthesisRequest, SpeechSynthesisResult, SpeechSynthesisStreamRequest
+
+class FakeSynthesisProvider(SpeechSynthesisProvider):
+    def __init__(self, **kwargs):
+        super().__init__(api_key="", model_id="", api_url="", **kwargs)
+        self.calls = 0
+
+    async def _open_conn(self):
+        return object()
+
+    async def synthesize(self, request, conn):
+        self.calls += 1
+        return SpeechSynthesisResult(audio=request.text.encode())
+
+class FakeStreamingProvider(FakeSynthesisProvider):
+    async def synthesize_stream(self, request, conn):
+        async for text in request.text_stream: yield text.encode()
+
+class FakeRecognitionStreamer(PipelineProvider):
+    def __init__(self):
+        super().__init__(capabilities=PipelineCapabilities.SPEECH_RECOGNITION)
+
+    async def stream_request(self, request):
+        yield b"transcript"
+
+async def text_stream(*chunks):
+    for chunk in chunks:
+        await asyncio.sleep(0)
+        yield chunk
+
+def id_time(id):
+    return id >> 32
+
+def now_ms():
+    return time.time_ns() // 1_000_000 - _EPOCH_MS
+
+class ResultIdTest(unittest.TestCase):
+    def test_ids_carry_the_process_id_in_the_low_bits(self):
+        ids = [ _next_id() for _ in range(3000) ]
+        self.assertEqual(ids, sorted(set(ids)))
+        self.assertTrue(all(id & 0x3FFFFF == os.getpid() for id in ids))
+
+    def test_ids_catch_up_with_the_clock(self):
+        for _ in range(5000): _next_id()
+        time.sleep(0.05)
+        self.assertLessEqual(abs(id_time(_next_id()) - now_ms()), 10)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork()")
+    def test_forked_children_get_their_own_ids(self):
+        parent = _next_id()
+        read, write = os.pipe()
+        if (pid := os.fork()) == 0:
+            os.write(write, str(_next_id()).encode())
+            os._exit(0)
+        os.close(write)
+        with os.fdopen(read) as pipe: child = int(pipe.read())
+        os.waitpid(pid, 0)
+        self.assertEqual(child & 0x3FFFFF, pid)
+        self.assertNotIn(child, (parent, _next_id()))
+
+class ProviderLifecycleTest(unittest.IsolatedAsyncioTestCase):
+    async def test_initialize_after_cleanup_reopens_the_pool(self):
+        provider = FakeSynthesisProvider(num_prewarm=2)
+        await provider.initialize()
+        await provider.cleanup()
+        self.assertTrue(await provider.initialize())
+        self.assertEqual(provider._pool.idle, 2)
+        result = await provider.process_request(SpeechSynthesisRequest(text="again"))
+        self.assertEqual(result.audio, b"again")
+
+class SynthesisCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def test_identical_requests_are_served_from_cache(self):
+        provider = FakeSynthesisProvider()
+        first = await provider.process_request(SpeechSynthesisRequest(text="hello"))
+        second = await provider.process_request(SpeechSynthesisRequest(text="hello"))
+        self.assertEqual((provider.calls, second.audio), (1, first.audio))
+
+    async def test_cache_hit_is_a_new_result(self):
+        provider = FakeSynthesisProvider()
+        first = await provider.process_request(SpeechSynthesisRequest(text="hello"))
+        second = await provider.process_request(SpeechSynthesisRequest(text="hello"))
+        self.assertNotEqual(first.id, second.id)
+        self.assertGreaterEqual(second.created, first.created)
+
+    async def test_different_settings_miss_the_cache(self):
+        provider = FakeSynthesisProvider()
+        await provider.process_request(SpeechSynthesisRequest(text="hello"))
+        await provider.process_request(SpeechSynthesisRequest(text="hello", speed=2.0))
+        self.assertEqual(provider.calls, 2)
+
+    async def test_least_recently_used_result_is_evicted(self):
+        provider = FakeSynthesisProvider(cache_size=2)
+        for text in ("a", "b", "a", "c", "a", "b"): await provider.process_request(SpeechSynthesisRequest(text=text))
+        self.assertEqual(provider.calls, 4)
+
+    async def test_cache_can_be_disabled(self):
+        provider = FakeSynthesisProvider(cache_size=0)
+        for _ in range(2): await provider.process_request(SpeechSynthesisRequest(text="hello"))
+        self.assertEqual(provider.calls, 2)
+
+class SynthesisStreamTest(unittest.IsolatedAsyncioTestCase):
+    async def test_stream_requests_are_not_processed_or_cached(self):
+        provider = FakeStreamingProvider()
+        with self.assertRaises(ValueError):
+            await provider.process_request(SpeechSynthesisStreamRequest(text_stream=text_stream("hello")))
+        self.assertEqual(len(provider._cache), 0)
+
+    async def test_stream_request_yields_audio_per_chunk(self):
+        provider = FakeStreamingProvider()
+        request = SpeechSynthesisStreamRequest(text_stream=text_stream("hel", "lo"))
+        self.assertEqual([ chunk async for chunk in provider.stream_request(request) ], [b"hel", b"lo"])
+
+    async def test_pipeline_streams_only_through_streaming_providers(self):
+        pipeline = Pipeline(streams=[ PipelineFlow(provider=FakeSynthesisProvider()), PipelineFlow(provider=FakeStreamingProvider()) ])
+        request = SpeechSynthesisStreamRequest(text_stream=text_stream("hi"))
+        self.assertEqual([ chunk async for chunk in pipeline.stream_response(request) ], [b"hi"])
+
+    async def test_pipeline_streams_through_the_provider_with_the_request_capability(self):
+        pipeline = Pipeline(streams=[ PipelineFlow(provider=FakeRecognitionStreamer()), PipelineFlow(provider=FakeStreamingProvider()) ])
+        request = SpeechSynthesisStreamRequest(text_stream=text_stream("hi"))
+        self.assertEqual([ chunk async for chunk in pipeline.stream_response(request) ], [b"hi"])
+
+    async def test_pipeline_without_streaming_providers_raises(self):
+        pipeline = Pipeline(streams=[ PipelineFlow(provider=FakeSynthesisProvider()) ])
+        with self.assertRaises(ValueError):
+            async for _ in pipeline.stream_response(SpeechSynthesisStreamRequest(text_stream=text_stream("hi"))): pass
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# Kirigen releases 'pipelines' as an open-source library for orchestrating and managing pipelines, 
+# in the hope of enableing developers to create complex workflows with ease. see https://kirigen.co/opensource-initiatives
+#
+# This file (as part of the 'pipelines' library) is open-source and available under the MIT license
+# For more information, see the project repository at https://github.com/kirigen-ai/pipelines
+#
+# Copyright (c) 2025 Kirigen, all rights reserved.
+
+
+import random, unittest
+
+from kirigen.pipelines import BalancingPolicy
+from kirigen.pipelines._fast import StreamBalancer
+
+class StreamBalancerTest(unittest.TestCase):
+    def test_least_loaded_spreads_requests(self):
+        balancer = StreamBalancer(BalancingPolicy.LEAST_LOADED, [4, 4, 4])
+        picks = [ balancer.acquire() for _ in range(6) ]
+        self.assertEqual(sorted(picks), [0, 0, 1, 1, 2, 2])
+        self.assertEqual(list(balancer.loads), [2, 2, 2])
+
+    def test_least_loaded_picks_released_stream(self):
+        balancer = StreamBalancer(BalancingPolicy.LEAST_LOADED, [4, 4, 4])
+        for _ in range(6): balancer.acquire()
+        balancer.release(1)
+        balancer.release(1)
+        self.assertEqual(balancer.acquire(), 1)
+
+    def test_least_loaded_heap_stays_bounded_and_consistent(self):
+        rng = random.Random(7)
+        balancer = StreamBalancer(BalancingPolicy.LEAST_LOADED, [8] * 4)
+        held = []
+        for _ in range(2000):
+            if held and rng.random() < 0.5: balancer.release(held.pop(rng.randrange(len(held))))
+            else:
+                lowest = min(balancer.loads)
+                idx = balancer.acquire()
+                self.assertEqual(balancer.loads[idx] - 1, lowest)
+                held.append(idx)
+            self.assertLessEqual(len(balancer.heap), 4 * len(balancer.loads) + 1)
+        self.assertEqual(sorted(held), sorted(i for i, load in enumerate(balancer.loads) for _ in range(load)))
+
+    def test_round_robin_cycles_streams(self):
+        balancer = StreamBalancer(BalancingPolicy.ROUND_ROBIN, [1, 1, 1])
+        self.assertEqual([ balancer.acquire() for _ in range(5) ], [0, 1, 2, 0, 1])
+
+    def test_fifo_fills_streams_in_order(self):
+        balancer = StreamBalancer(BalancingPolicy.FIFO, [2, 1])
+        self.assertEqual([ balancer.acquire() for _ in range(4) ], [0, 0, 1, 0])
+
+    def test_random_picks_the_less_loaded_of_two(self):
+        balancer = StreamBalancer(BalancingPolicy.RANDOM, [4, 4])
+        balancer.loads[0] = 3
+        self.assertEqual(balancer.acquire(), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# Kirigen releases 'pipelines' as an open-source library for orchestrating and managing pipelines, 
+# in the hope of enableing developers to create complex workflows with ease. see https://kirigen.co/opensource-initiatives
+#
+# This file (as part of the 'pipelines' library) is open-source and available under the MIT license
+# For more information, see the project repository at https://github.com/kirigen-ai/pipelines
+#
+# Copyright (c) 2025 Kirigen, all rights reserved.
+
+
+import asyncio, unittest
+
+from kirigen.pipelines.utils import ConnectionPool
+
+class FakeConnections:
+    def __init__(self, fail_on=()):
+        self.attempts, self.opened, self.closed, self.fail_on = 0, [], [], set(fail_on)
+
+    async def connect(self):
+        self.attempts += 1
+        conn = self.attempts
+        await asyncio.sleep(0)
+        if conn in self.fail_on: raise ConnectionError(conn)
+        self.opened.append(conn)
+        return conn
+
+    async def close(self, conn):
+        self.closed.append(conn)
+
+class ConnectionPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def test_reuses_returned_connection(self):
+        conns = FakeConnections()
+        pool = ConnectionPool(conns.connect, conns.close)
+        async with pool.get() as first: pass
+        async with pool.get() as second: pass
+        self.assertEqual(first, second)
+        self.assertEqual(conns.opened, [1])
+
+    async def test_discards_connection_when_body_raises(self):
+        conns = FakeConnections()
+        pool = ConnectionPool(conns.connect, conns.close)
+        with self.assertRaises(ValueError):
+            async with pool.get(): raise ValueError()
+        self.assertEqual((pool.idle, conns.closed), (0, [1]))
+
+    async def test_invalidated_connection_is_closed(self):
+        conns = FakeConnections()
+        pool = ConnectionPool(conns.connect, conns.close)
+        async with pool.get() as conn: pool.invalidate(conn)
+        self.assertEqual((pool.idle, conns.closed), (0, [1]))
+
+    async def test_prewarm_closes_opened_connections_when_one_fails(self):
+        conns = FakeConnections(fail_on={2})
+        pool = ConnectionPool(conns.connect, conns.close, max_size=3)
+        with self.assertRaises(ConnectionError):
+            await pool.prewarm(3)
+        self.assertEqual(sorted(conns.closed), sorted(conns.opened))
+        self.assertEqual(pool.idle, 0)
+        await pool.prewarm(3)
+        self.assertEqual(pool.idle, 3)
+
+    async def test_prewarm_does_not_wait_for_borrowed_connections(self):
+        conns = FakeConnections()
+        pool = ConnectionPool(conns.connect, conns.close, max_size=2)
+        async with pool.get(), pool.get():
+            await asyncio.wait_for(pool.prewarm(2), timeout=1)
+        self.assertEqual((pool.idle, len(conns.opened)), (2, 2))
+
+    async def test_max_size_bounds_open_connections(self):
+        conns = FakeConnections()
+        pool = ConnectionPool(conns.connect, conns.close, max_size=1)
+        async with pool.get():
+            waiter = asyncio.ensure_future(pool.get().__aenter__())
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiter.done())
+        await asyncio.wait_for(waiter, timeout=1)
+        self.assertEqual(conns.opened, [1])
+
+    async def test_connections_returned_after_close_are_closed(self):
+        conns = FakeConnections()
+        pool = ConnectionPool(conns.connect, conns.close)
+        async with pool.get():
+            await pool.aclose()
+        self.assertEqual((pool.idle, conns.closed), (0, [1]))
+        with self.assertRaises(RuntimeError):
+            async with pool.get(): pass
+
+if __name__ == "__main__":
+    unittest.main()
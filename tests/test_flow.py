@@ -0,0 +1,172 @@
+# Kirigen releases 'pipelines' as an open-source library for orchestrating and managing pipelines, 
+# in the hope of enableing developers to create complex workflows with ease. see https://kirigen.co/opensource-initiatives
+#
+# This file (as part of the 'pipelines' library) is open-source and available under the MIT license
+# For more information, see the project repository at https://github.com/kirigen-ai/pipelines
+#
+# Copyright (c) 2025 Kirigen, all rights reserved.
+
+
+import asyncio, unittest
+
+from kirigen.pipelines import BalancingPolicy, BatchFlow, Pipeline, PipelineFlow, PipelineProvider, PriorityFlow, SequentialFlow
+from kirigen.pipelines.audio.requests import SpeechSynthesisRequest
+
+class EchoProvider(PipelineProvider):
+    async def process_request(self, request):
+        return request
+
+class ShortBatchProvider(EchoProvider):
+    async def process_batch(self, requests):
+        return requests[:-1]
+
+class SlowProvider(PipelineProvider):
+    def __init__(self):
+        super().__init__()
+        self.running = self.peak = 0
+
+    async def process_request(self, request):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if isinstance(request, Exception): raise request
+        return request
+
+async def drain(flow, count):
+    responses = []
+    async for request, response in flow.process_requests():
+        responses.append((request, response))
+        if len(responses) == count: break
+    return responses
+
+class DispatchTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrency_is_capped_by_max_requests(self):
+        provider = SlowProvider()
+        flow = PipelineFlow(max_requests=3, provider=provider)
+        for i in range(10): flow.add_request(i)
+        responses = await drain(flow, 10)
+        self.assertEqual(sorted(response for _, response in responses), list(range(10)))
+        self.assertEqual(provider.peak, 3)
+
+    async def test_provider_exception_is_yielded_as_response(self):
+        flow = PipelineFlow(provider=SlowProvider())
+        error = RuntimeError("boom")
+        flow.add_request(error)
+        [(request, response)] = await drain(flow, 1)
+        self.assertIs(response, error)
+        self.assertEqual(flow.load, 0)
+
+    async def test_idle_consumer_wakes_on_add_request(self):
+        flow = PipelineFlow(provider=EchoProvider())
+        consumer = asyncio.ensure_future(drain(flow, 1))
+        await asyncio.sleep(0.01)
+        self.assertFalse(consumer.done())
+        flow.add_request("late")
+        self.assertEqual(await asyncio.wait_for(consumer, timeout=1), [("late", "late")])
+
+    async def test_child_streams_use_their_own_slots(self):
+        providers = [ SlowProvider(), SlowProvider() ]
+        children = [ PipelineFlow(max_requests=1, provider=provider) for provider in providers ]
+        flow = PipelineFlow(max_requests=8, policy=BalancingPolicy.ROUND_ROBIN, streams=children)
+        for i in range(6): flow.add_request(i)
+        await drain(flow, 6)
+        self.assertEqual([ provider.peak for provider in providers ], [1, 1])
+        self.assertEqual(flow.load, 0)
+
+class RequestMetricsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_metrics_are_keyed_by_request_id(self):
+        flow = PipelineFlow(provider=EchoProvider())
+        request = flow.add_request(SpeechSynthesisRequest(text="hello"))
+        await drain(flow, 1)
+        metrics = flow.request_metrics(request.id)
+        self.assertIsNotNone(metrics)
+        self.assertGreater(metrics.total_processing_time, 0)
+
+    async def test_requests_get_distinct_ids(self):
+        first, second = SpeechSynthesisRequest(text="a"), SpeechSynthesisRequest(text="a")
+        self.assertNotEqual(first.id, second.id)
+
+    async def test_queued_requests_beyond_capacity_keep_their_metrics(self):
+        flow = SequentialFlow("sequential", provider=EchoProvider())
+        requests = [ flow.add_request(SpeechSynthesisRequest(text=str(i))) for i in range(flow._metrics_capacity + 4) ]
+        self.assertTrue(all(flow.request_metrics(request.id) for request in requests))
+        await drain(flow, 4)
+        self.assertTrue(all(flow.request_metrics(request.id).total_processing_time > 0 for request in requests[:4]))
+
+    async def test_least_recently_used_completed_metrics_are_evicted(self):
+        flow = SequentialFlow("sequential", provider=EchoProvider())
+        requests = [ flow.add_request(SpeechSynthesisRequest(text=str(i))) for i in range(flow._metrics_capacity + 1) ]
+        await drain(flow, flow._metrics_capacity)
+        self.assertIsNotNone(flow.request_metrics(requests[0].id))         # refreshes the oldest entry
+        await drain(flow, 1)
+        self.assertIsNotNone(flow.request_metrics(requests[0].id))
+        self.assertIsNone(flow.request_metrics(requests[1].id))
+
+class PriorityQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.flow = PriorityFlow("priority", provider=EchoProvider())
+
+    def pop_all(self):
+        popped = []
+        while self.flow.queue: popped.append(self.flow._pop())
+        return popped
+
+    def test_lower_priority_value_goes_first_and_ties_keep_arrival_order(self):
+        a, b, c, d = requests = [ SpeechSynthesisRequest(text=text) for text in "abcd" ]
+        for request, priority in zip(requests, (2, 1, 2, 0)): self.flow.add_request(request, priority)
+        self.assertEqual(self.pop_all(), [d, b, a, c])
+
+    def test_request_queued_twice_pops_twice(self):
+        request = SpeechSynthesisRequest(text="twice")
+        self.flow.add_request(request, 1)
+        self.flow.add_request(request, 2)
+        self.assertEqual(self.pop_all(), [request, request])
+        self.assertEqual(self.flow._entries, {})
+
+    def test_reprioritize_moves_a_queued_request(self):
+        a, b, c = requests = [ SpeechSynthesisRequest(text=text) for text in "abc" ]
+        for request in requests: self.flow.add_request(request, 1)
+        self.assertTrue(self.flow.reprioritize(c, 0))
+        self.assertEqual(self.pop_all(), [c, a, b])
+        self.assertFalse(self.flow.reprioritize(c, 0))
+
+    def test_fifo_flows_cannot_reprioritize(self):
+        flow = PipelineFlow(policy=BalancingPolicy.FIFO, provider=EchoProvider())
+        request = flow.add_request(SpeechSynthesisRequest(text="a"))
+        self.assertFalse(flow.reprioritize(request, 0))
+
+class BatchFlowTest(unittest.IsolatedAsyncioTestCase):
+    async def test_short_batch_fails_every_request(self):
+        flow = BatchFlow("batch", max_requests=3, provider=ShortBatchProvider())
+        for text in "abc": flow.add_request(SpeechSynthesisRequest(text=text))
+        responses = await drain(flow, 3)
+        self.assertEqual(len(responses), 3)
+        self.assertTrue(all(isinstance(response, ValueError) for _, response in responses))
+
+    def test_requires_a_provider(self):
+        with self.assertRaises(ValueError):
+            BatchFlow("batch", streams=[ PipelineFlow(provider=EchoProvider()) ])
+
+class PipelineLoopTest(unittest.IsolatedAsyncioTestCase):
+    def test_start_requires_a_running_loop(self):
+        with self.assertRaises(RuntimeError):
+            Pipeline().start()
+
+    async def test_start_configures_the_running_loop(self):
+        pipeline = Pipeline()
+        asyncio.get_running_loop().set_debug(True)
+        pipeline.start()
+        self.assertFalse(asyncio.get_running_loop().get_debug())
+        self.assertIsNotNone(pipeline._executor)
+        pipeline.stop()
+
+    async def test_default_executor_works_after_stop(self):
+        pipeline = Pipeline()
+        pipeline.start()
+        self.assertEqual(await asyncio.to_thread(sum, [1, 2]), 3)
+        pipeline.stop()
+        self.assertEqual(await asyncio.to_thread(sum, [3, 4]), 7)
+
+if __name__ == "__main__":
+    unittest.main()